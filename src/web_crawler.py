@@ -0,0 +1,782 @@
+import asyncio
+import functools
+import logging
+import mmap
+import os
+import socket
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urldefrag, urljoin, urlparse
+import ahocorasick
+import aiodns
+import httpx
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from lxml import etree, html as lxml_html
+import numpy
+import xxhash
+
+# Configure logging to display crawl progress and errors
+logging.basicConfig(
+    format='%(asctime)s %(levelname)s:%(message)s',
+    level=logging.INFO
+)
+
+UTF8_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+DNS_CACHE_TTL = 300  # Seconds to trust a cached DNS answer
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:88.0) Gecko/20100101 Firefox/88.0'
+BLOCKED_RESOURCES = '**/*.{png,jpg,jpeg,gif,svg,woff,woff2,mp4,css}'  # Not needed to find links
+OUTPUT_CHUNK = 1024 * 1024  # Bytes of room mapped ahead at the end of the output file
+
+
+@functools.lru_cache(maxsize=16)
+def _automaton(patterns):
+    """
+    Compile link patterns into an Aho-Corasick automaton, once per process and pattern set.
+
+    Args:
+        patterns (tuple): Substrings to look for in links.
+
+    Returns:
+        ahocorasick.Automaton: An automaton matching all patterns in a single pass.
+    """
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+
+def _filter_links(base_url, paths, patterns=()):
+    """
+    Resolve relative links, strip fragments and keep those that match specified criteria.
+    Raw hrefs from lxml and absolute hrefs from the browser go through the same rules.
+
+    Args:
+        base_url (str): The base URL for resolving relative links.
+        paths (iterable): The raw href values found on the page.
+        patterns (tuple): If given, only links containing at least one of these substrings are kept.
+
+    Yields:
+        str: Filtered URLs that match specified criteria.
+    """
+    base = urlparse(base_url)
+    origin = f'{base.scheme}://{base.netloc}'
+    origin_prefix = origin + '/'
+    automaton = _automaton(patterns) if patterns else None
+    for path in paths:
+        path = urldefrag(path.strip()).url  # '#top' anchors point back at a page already queued
+        if not path:
+            continue
+        if path.startswith('/') and not path.startswith('//'):  # '//host/...' may point to another domain
+            same_origin = True
+            path = urljoin(base_url, path)  # Resolve root-relative paths
+        else:
+            same_origin = False
+            if not path.startswith('http'):
+                path = urljoin(base_url, path)  # Resolve relative paths; other schemes fail the origin check
+        if path == base_url:
+            continue  # Links back to the page itself
+        # Check if the link belongs to the same origin as the base URL with a plain prefix test
+        if not (same_origin or path.startswith(origin_prefix) or path == origin):
+            continue
+        # Filter URLs based on specific substrings, matching all patterns in one pass over the URL
+        if automaton is None or next(automaton.iter(path), None) is not None:
+            yield path
+
+
+def _iter_linked_urls(base_url, html, patterns=()):
+    """
+    Extract and filter links from the provided HTML content.
+
+    Args:
+        base_url (str): The base URL for resolving relative links.
+        html (str): The HTML content to parse for links.
+        patterns (tuple): If given, only links containing at least one of these substrings are kept.
+
+    Yields:
+        str: Filtered URLs that match specified criteria.
+    """
+    try:
+        try:
+            document = lxml_html.fromstring(html)
+        except ValueError:
+            # lxml rejects str input carrying an XML encoding declaration
+            document = lxml_html.fromstring(html.encode('utf-8'), parser=UTF8_HTML_PARSER)
+    except etree.ParserError as e:
+        logging.error(f'Error parsing {base_url}: {e}')
+        return
+    yield from _filter_links(base_url, (
+        path for element, attribute, path, _ in document.iterlinks()
+        if element.tag == 'a' and attribute == 'href'
+    ), patterns)
+
+
+def _looks_complete(html):
+    """
+    Guess whether a page fetched without a browser is server-rendered and already contains its links.
+
+    Args:
+        html (str): The HTML content returned by the HTTP client.
+
+    Returns:
+        bool: True if the page has a closing body tag and at least five anchors.
+    """
+    return '</body>' in html and html.count('<a ') >= 5
+
+
+def _extract_links(base_url, html, patterns=()):
+    """
+    Collect the links of a page into a list so they can be returned from a parser worker process.
+
+    Args:
+        base_url (str): The base URL for resolving relative links.
+        html (str): The HTML content to parse for links.
+        patterns (tuple): If given, only links containing at least one of these substrings are kept.
+
+    Returns:
+        list: Filtered URLs that match specified criteria.
+    """
+    return list(_iter_linked_urls(base_url, html, patterns))
+
+
+class FrontierDRUM:
+    """
+    A disk-backed URL frontier in the style of DRUM (Disk Repository with Update Management).
+
+    New URLs are hashed into bucket files. When a bucket fills up, its hashes are sorted and merged
+    against the bucket's sorted file of every hash seen so far, and only unseen URLs are appended to
+    the queue file, in the order they arrived within the bucket. Memory use is bounded by the size
+    of one bucket, however large the crawl grows.
+
+    A crawl can be resumed by opening the frontier on the same directory with the same number of
+    buckets: unread queue entries, unmerged buckets and seen hashes are all picked up again.
+
+    Attributes:
+        directory (str): Directory holding the bucket, seen-hash and queue files.
+        num_buckets (int): Number of bucket files, a power of two.
+        bucket_cap (int): Size in bytes at which a bucket is merged.
+    """
+
+    def __init__(self, directory=None, num_buckets=256, bucket_cap_mb=16):
+        """
+        Initialize the frontier in the given directory, resuming from any files left there by an
+        earlier run, or in a temporary one if none is given.
+        """
+        if num_buckets & (num_buckets - 1):
+            raise ValueError(f'num_buckets must be a power of two, got {num_buckets}')
+        self.tmpdir = None
+        if directory is None:
+            self.tmpdir = tempfile.TemporaryDirectory(prefix='frontier-')
+            directory = self.tmpdir.name
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.num_buckets = num_buckets
+        self.bucket_cap = bucket_cap_mb * 1024 * 1024
+        self.bucket_files = {}
+        self.bucket_sizes = [
+            os.path.getsize(path) if os.path.exists(path) else 0
+            for path in map(self.bucket_path, range(num_buckets))
+        ]
+        queue_path = os.path.join(directory, 'queue.bin')
+        self.queue_file = open(queue_path, 'r+b' if os.path.exists(queue_path) else 'w+b')
+        # The read position is kept on disk so a resumed crawl doesn't revisit consumed entries
+        pos_path = os.path.join(directory, 'queue.pos')
+        self.queue_pos_file = open(pos_path, 'r+b' if os.path.exists(pos_path) else 'w+b', buffering=0)
+        self.queue_read = int.from_bytes(self.queue_pos_file.read(8), 'little')
+
+    def bucket_path(self, bucket):
+        """
+        Return the path of the file buffering a bucket's newly added URLs.
+        """
+        return os.path.join(self.directory, f'bucket-{bucket}.bin')
+
+    def seen_path(self, bucket):
+        """
+        Return the path of the sorted file of every hash merged into a bucket.
+        """
+        return os.path.join(self.directory, f'seen-{bucket}.u64')
+
+    def add(self, url):
+        """
+        Record a URL in its bucket. Duplicates are only filtered out when the bucket is merged.
+
+        Args:
+            url (str): The URL to add.
+        """
+        data = url.encode('utf-8')
+        if len(data) > 0xFFFF:
+            logging.warning(f'Skipping URL longer than 64 KiB: {url[:100]}...')
+            return
+        h = xxhash.xxh64_intdigest(data)
+        bucket = h & (self.num_buckets - 1)
+        if bucket not in self.bucket_files:
+            self.bucket_files[bucket] = open(self.bucket_path(bucket), 'ab')
+        self.bucket_files[bucket].write(h.to_bytes(8, 'little') + len(data).to_bytes(2, 'little') + data)
+        self.bucket_sizes[bucket] += 10 + len(data)
+        if self.bucket_sizes[bucket] >= self.bucket_cap:
+            self.merge(bucket)
+
+    def merge(self, bucket):
+        """
+        Sort-merge a bucket against the hashes already seen, appending unseen URLs to the queue file.
+
+        Args:
+            bucket (int): The bucket to merge.
+        """
+        if bucket in self.bucket_files:
+            self.bucket_files.pop(bucket).close()
+        with open(self.bucket_path(bucket), 'rb') as fh:
+            records = fh.read()
+
+        hashes, urls = [], []
+        offset = 0
+        while offset < len(records):
+            hashes.append(int.from_bytes(records[offset:offset + 8], 'little'))
+            length = int.from_bytes(records[offset + 8:offset + 10], 'little')
+            urls.append(records[offset + 10:offset + 10 + length])
+            offset += 10 + length
+
+        # Keep the first occurrence of each hash, then drop hashes merged earlier
+        unique, first = numpy.unique(numpy.array(hashes, dtype=numpy.uint64), return_index=True)
+        seen_path = self.seen_path(bucket)
+        seen = numpy.fromfile(seen_path, dtype='<u8') if os.path.exists(seen_path) else numpy.empty(0, '<u8')
+        unseen = ~numpy.isin(unique, seen, assume_unique=True)
+        if unseen.any():
+            self.queue_file.seek(0, os.SEEK_END)
+            for index in numpy.sort(first[unseen]):  # Restore arrival order
+                url = urls[index]
+                self.queue_file.write(len(url).to_bytes(2, 'little') + url)
+            self.queue_file.flush()
+            numpy.union1d(seen, unique[unseen]).astype('<u8').tofile(seen_path + '.tmp')
+            os.replace(seen_path + '.tmp', seen_path)
+        # Only empty the bucket once its URLs are safely queued
+        os.truncate(self.bucket_path(bucket), 0)
+        self.bucket_sizes[bucket] = 0
+
+    def flush(self):
+        """
+        Merge every non-empty bucket so all pending URLs reach the queue file.
+        """
+        for bucket, size in enumerate(self.bucket_sizes):
+            if size:
+                self.merge(bucket)
+
+    def pop(self):
+        """
+        Take the next unseen URL off the queue file, merging pending buckets when it runs dry.
+
+        Returns:
+            str or None: The next URL to visit, or None if the frontier is empty.
+        """
+        self.queue_file.seek(0, os.SEEK_END)
+        if self.queue_read >= self.queue_file.tell():
+            # Everything queued so far was consumed, so reclaim the space before merging more in
+            self.queue_file.truncate(0)
+            self.queue_read = 0
+            self.save_queue_read()
+            self.flush()
+            self.queue_file.seek(0, os.SEEK_END)
+            if self.queue_file.tell() == 0:
+                return None
+        self.queue_file.seek(self.queue_read)
+        length = int.from_bytes(self.queue_file.read(2), 'little')
+        url = self.queue_file.read(length).decode('utf-8')
+        self.queue_read += 2 + length
+        self.save_queue_read()
+        return url
+
+    def requeue(self, urls):
+        """
+        Append URLs that were taken off the queue but never visited back onto its end.
+        They skip the merge, since their hashes are already recorded as seen.
+
+        Args:
+            urls (list): The URLs to hand out again.
+        """
+        self.queue_file.seek(0, os.SEEK_END)
+        for url in urls:
+            data = url.encode('utf-8')
+            self.queue_file.write(len(data).to_bytes(2, 'little') + data)
+        self.queue_file.flush()
+
+    def save_queue_read(self):
+        """
+        Persist the queue file's read position for a later run to resume from.
+        """
+        self.queue_pos_file.seek(0)
+        self.queue_pos_file.write(self.queue_read.to_bytes(8, 'little'))
+
+    def close(self):
+        """
+        Close the frontier's files and remove its temporary directory, if it created one.
+        """
+        for fh in self.bucket_files.values():
+            fh.close()
+        self.bucket_files.clear()
+        self.queue_file.close()
+        self.queue_pos_file.close()
+        if self.tmpdir is not None:
+            self.tmpdir.cleanup()
+
+
+class Crawler:
+    """
+    A web crawler class to asynchronously scrape websites for specific links.
+
+    Attributes:
+        urls (list): List of initial URLs to start crawling from.
+        max_urls (int): Maximum number of URLs to crawl.
+        output_file (str): File to save visited URLs.
+        max_concurrency (int): Number of worker tasks, i.e. the maximum number of pages fetched at the same time.
+        politeness_delay (float): Minimum delay in seconds between requests to the same host.
+        link_patterns (tuple): Substrings a link must contain to be followed; all links are followed if empty.
+        visited_count (int): Number of URLs crawled so far.
+        frontier (FrontierDRUM): Disk-backed frontier that deduplicates every URL ever queued, opened on first use.
+        urls_to_visit (asyncio.Queue): Small in-memory FIFO queue of URLs taken from the frontier, feeding the workers.
+    """
+
+    # File extensions that never contain HTML links worth following
+    SKIP_EXT = {'.pdf', '.jpg', '.jpeg', '.png', '.gif', '.zip', '.mp4', '.mp3', '.svg', '.css', '.js',
+                '.ico', '.woff', '.woff2'}
+
+    def __init__(self, urls=[], max_urls=100, output_file='visited_links.txt',
+                 max_concurrency=5, politeness_delay=1.0, frontier_dir=None, link_patterns=()):
+        """
+        Initialize the crawler with starting URLs, max URLs to visit, and output file for results.
+        The frontier is kept in `frontier_dir`, or in a temporary directory if none is given.
+        """
+        self.urls = urls
+        self.max_urls = max_urls
+        self.output_file = output_file
+        self.max_concurrency = max_concurrency
+        self.politeness_delay = politeness_delay
+        self.link_patterns = tuple(link_patterns)
+        self.visited_count = 0
+        self.frontier_dir = frontier_dir
+        self.frontier = None
+        self.frontier_pool = None
+        self.urls_to_visit = asyncio.Queue(maxsize=2 * max_concurrency)
+        self.refill_lock = asyncio.Lock()
+        self.host_next_ok = {}
+        self.out_fd = None
+        self.out_mm = None
+        self.out_offset = 0
+        self.parse_pool = None
+        self.resolver = None
+        self.dns_cache = {}
+        self.client = None
+        self.playwright = None
+        self.browser = None
+
+    def open_frontier(self):
+        """
+        Open the frontier and add the starting URLs to it.
+        """
+        self.frontier = FrontierDRUM(self.frontier_dir)
+        for url in self.urls:
+            self.frontier.add(url)
+
+    def close_frontier(self):
+        """
+        Close the frontier, removing it from disk unless it lives in `frontier_dir`.
+        URLs still waiting in the in-memory queue are written back first, so a resumed crawl visits them.
+        """
+        if self.frontier is not None:
+            unvisited = []
+            while not self.urls_to_visit.empty():
+                unvisited.append(self.urls_to_visit.get_nowait())
+            self.frontier.requeue(unvisited)
+            self.frontier.close()
+            self.frontier = None
+
+    def open_output(self):
+        """
+        Map the output file into memory with OUTPUT_CHUNK bytes of room after its current content.
+        Previous results are kept; the NUL padding left behind by an interrupted run is reused.
+        """
+        self.out_fd = os.open(self.output_file, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self.out_fd).st_size
+        self.map_output(size + OUTPUT_CHUNK)
+        padding = self.out_mm.find(b'\0', 0, size)
+        self.out_offset = size if padding == -1 else padding
+
+    def map_output(self, size):
+        """
+        Grow the output file to `size` bytes and map all of it, replacing any previous mapping.
+        Remapping is used instead of mmap.resize, which isn't available on macOS.
+
+        Args:
+            size (int): The new size of the file and mapping in bytes.
+        """
+        if self.out_mm is not None:
+            self.out_mm.close()
+        os.ftruncate(self.out_fd, size)
+        self.out_mm = mmap.mmap(self.out_fd, size)
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self.out_mm.madvise(mmap.MADV_SEQUENTIAL)
+
+    def save_visited_url(self, url):
+        """
+        Append a newly visited URL to the output file.
+        Writes go straight into the memory-mapped file, which is remapped at double the size when full,
+        so saving a URL costs no syscall. The mapping is shared, so written URLs survive the crawler being
+        killed; they are only synced to disk in close_output, keeping msync off the event loop.
+
+        Args:
+            url (str): The visited URL to save.
+        """
+        if self.out_mm is None:
+            self.open_output()
+        line = (url + '\n').encode('utf-8')
+        end = self.out_offset + len(line)
+        if end > len(self.out_mm):
+            self.map_output(max(end, 2 * len(self.out_mm)))
+        self.out_mm[self.out_offset:end] = line
+        self.out_offset = end
+
+    def close_output(self):
+        """
+        Flush the output file and trim the unused room mapped at its end.
+        """
+        if self.out_mm is None:
+            return
+        self.out_mm.flush()
+        self.out_mm.close()
+        os.ftruncate(self.out_fd, self.out_offset)
+        os.close(self.out_fd)
+        self.out_mm = None
+        self.out_fd = None
+
+    async def init_browser(self):
+        """
+        Initialize the Playwright browser instance, the HTTP client, the DNS resolver and the process pool
+        used to parse pages.
+        """
+        self.parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        # A single thread keeps frontier file access serialized and its merges off the event loop
+        self.frontier_pool = ThreadPoolExecutor(max_workers=1)
+        self.resolver = aiodns.DNSResolver()
+        self.client = httpx.AsyncClient(
+            http2=True,
+            follow_redirects=True,
+            timeout=20,
+            headers={'User-Agent': USER_AGENT},
+            verify=False,
+        )
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.firefox.launch(headless=True)
+
+    async def close_browser(self):
+        """
+        Close the browser, clean up Playwright resources, the frontier and flush the output file.
+        Safe to call after init_browser failed part way through.
+        """
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+        if self.resolver is not None:
+            self.resolver.cancel()  # aiodns 3 has no close(); its channel is freed with the resolver
+            self.resolver = None
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+            self.parse_pool = None
+        if self.frontier_pool is not None:
+            self.frontier_pool.shutdown()
+            self.frontier_pool = None
+        self.close_output()
+        self.close_frontier()
+
+    async def fetch_links(self, url):
+        """
+        Fetch a URL and return the links found on it, trying a plain HTTP request before
+        falling back to rendering the page in Playwright.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            list: Filtered URLs linked from the page, empty if the page is skipped or an error occurs.
+        """
+        if not await self.host_resolves(url):
+            logging.error(f'Skipping {url}: host does not resolve')
+            return []
+        await self.wait_politely(url)
+        is_html, html, base_url = await self.fetch_static(url)
+        if not is_html:
+            logging.info(f'Skipping {url}: not an HTML page')
+            return []
+        if html is None:
+            await self.wait_politely(url)  # The browser makes a second request to the same host
+            return await self.render_links(url)
+        # Parse in a worker process so the event loop keeps driving other downloads
+        loop = asyncio.get_running_loop()
+        # Resolve and filter links against the page's final URL, which may differ after redirects
+        return await loop.run_in_executor(self.parse_pool, _extract_links, base_url, html, self.link_patterns)
+
+    async def render_links(self, url):
+        """
+        Render a URL in Playwright and read its links straight from the browser's DOM,
+        without copying the page's HTML across to Python.
+        Each render gets its own short-lived browser context, configured with a custom
+        user agent and JavaScript support, so cookies and storage don't leak between unrelated pages.
+
+        Args:
+            url (str): The URL to render.
+
+        Returns:
+            list: Filtered URLs linked from the page, empty if an error occurs.
+        """
+        try:
+            context = await self.browser.new_context(
+                user_agent=USER_AGENT,
+                ignore_https_errors=True,
+                java_script_enabled=True,
+            )
+            try:
+                await context.route(BLOCKED_RESOURCES, lambda route: route.abort())
+                page = await context.new_page()
+                # Don't wait for 'networkidle': pages with analytics or websockets may never reach it
+                await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                try:
+                    # Give scripts a moment to render links; 'attached' so a hidden first anchor doesn't stall
+                    await page.wait_for_selector('a', state='attached', timeout=5000)
+                except PlaywrightTimeoutError:
+                    pass
+                # The browser resolves each href into an absolute URL, against the page's URL after redirects
+                hrefs = await page.eval_on_selector_all('a[href]', 'elements => elements.map(e => e.href)')
+                return list(_filter_links(page.url, hrefs, self.link_patterns))
+            finally:
+                await context.close()
+        except Exception as e:
+            logging.error(f'Error downloading {url}: {e}')
+            return []
+
+    async def fetch_static(self, url):
+        """
+        Fetch a URL with the HTTP client, which is far cheaper than rendering it in the browser.
+        The response is streamed so that non-HTML content is detected from the headers and its body
+        is never downloaded.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            tuple: (is_html, html, final_url), where is_html is False if the server reports a non-HTML
+                content type, html is the HTML content if the page looks server-rendered, or None if it
+                needs the browser, and final_url is the URL the page was served from after redirects.
+        """
+        try:
+            async with self.client.stream('GET', url) as response:
+                content_type = response.headers.get('content-type', '')
+                final_url = str(response.url)
+                if response.is_success and content_type and \
+                        not content_type.startswith(('text/html', 'application/xhtml+xml')):
+                    return False, None, final_url
+                if response.status_code != 200:
+                    return True, None, final_url  # Let the browser have a go at error pages and odd servers
+                await response.aread()
+        except httpx.HTTPError as e:
+            logging.warning(f'Static fetch failed for {url}: {e}')
+            return True, None, url
+        if _looks_complete(response.text):
+            return True, response.text, final_url
+        return True, None, final_url
+
+    async def host_resolves(self, url):
+        """
+        Check asynchronously that the URL's host exists, caching answers for DNS_CACHE_TTL seconds.
+        This only lets the crawler skip hosts that don't exist (NXDOMAIN or no records) instead of
+        waiting for the client or browser to fail on them. Neither of those reads `dns_cache`, so it
+        doesn't save them their own lookup.
+
+        Args:
+            url (str): The URL about to be fetched.
+
+        Returns:
+            bool: False if the host does not exist, True otherwise (including transient DNS errors).
+        """
+        host = urlparse(url).hostname
+        now = time.monotonic()
+        cached = self.dns_cache.get(host)
+        if cached is not None and cached[1] > now:
+            return cached[0] is not None
+        try:
+            result = await self.resolver.getaddrinfo(host, socket.AF_UNSPEC)
+            address = result.nodes[0].addr[0]
+        except aiodns.error.DNSError as e:
+            if e.args[0] not in (aiodns.error.ARES_ENOTFOUND, aiodns.error.ARES_ENODATA):
+                logging.warning(f'Error resolving {host}: {e}')
+                return True  # Let the browser try its own resolver
+            address = None
+        self.dns_cache[host] = (address, now + DNS_CACHE_TTL)
+        return address is not None
+
+    async def wait_politely(self, url):
+        """
+        Wait for the URL's host to be ready for another request, then book the host's next slot
+        `politeness_delay` seconds later. Hosts are scheduled independently, so only requests
+        to the same host wait on each other.
+
+        Args:
+            url (str): The URL about to be fetched.
+        """
+        host = urlparse(url).netloc
+        now = time.monotonic()
+        slot = max(now, self.host_next_ok.get(host, 0))
+        self.host_next_ok[host] = slot + self.politeness_delay  # Book before sleeping so concurrent fetches queue up
+        await asyncio.sleep(slot - now)
+
+    def get_linked_urls(self, base_url, html):
+        """
+        Extract and filter links from the provided HTML content.
+
+        Args:
+            base_url (str): The base URL for resolving relative links.
+            html (str): The HTML content to parse for links.
+
+        Yields:
+            str: Filtered URLs that match specified criteria.
+        """
+        return _iter_linked_urls(base_url, html, self.link_patterns)
+
+    def add_url_to_visit(self, url):
+        """
+        Add a URL to the frontier of URLs to visit. The frontier drops it if it was queued or visited before.
+        URLs pointing at images, documents and other assets listed in SKIP_EXT are ignored.
+
+        Args:
+            url (str): The URL to add to the queue.
+        """
+        if os.path.splitext(urlparse(url).path)[1].lower() in self.SKIP_EXT:
+            return
+        if self.frontier is None:
+            self.open_frontier()
+        self.frontier.add(url)
+
+    def add_urls_to_visit(self, urls):
+        """
+        Add several URLs to the frontier, so a page's links cost a single trip to the frontier thread.
+
+        Args:
+            urls (list): The URLs to add to the queue.
+        """
+        for url in urls:
+            self.add_url_to_visit(url)
+
+    def take_from_frontier(self, count):
+        """
+        Take up to `count` URLs off the frontier, merging buckets on disk if needed.
+
+        Args:
+            count (int): Maximum number of URLs to take.
+
+        Returns:
+            list: The URLs taken, fewer than `count` if the frontier ran out.
+        """
+        if self.frontier is None:
+            self.open_frontier()
+        urls = []
+        while len(urls) < count:
+            url = self.frontier.pop()
+            if url is None:
+                break
+            urls.append(url)
+        return urls
+
+    async def refill_queue(self):
+        """
+        Move URLs from the frontier into the in-memory queue until it is full, the frontier is empty,
+        or it holds every URL still to be crawled before reaching `max_urls`. URLs popped from the
+        frontier count as seen, so none are taken that won't be visited. The frontier is read in its
+        own thread, since popping may merge buckets on disk.
+        """
+        async with self.refill_lock:
+            queued = self.urls_to_visit.qsize()
+            free = min(self.urls_to_visit.maxsize - queued, self.max_urls - self.visited_count - queued)
+            if free <= 0:
+                return
+            loop = asyncio.get_running_loop()
+            for url in await loop.run_in_executor(self.frontier_pool, self.take_from_frontier, free):
+                self.urls_to_visit.put_nowait(url)
+
+    async def crawl(self, url):
+        """
+        Crawl a single URL, fetch the links on it, and queue them to visit.
+
+        Args:
+            url (str): The URL to crawl.
+        """
+        logging.info(f'Crawling: {url}')
+        self.visited_count += 1
+        try:
+            links = await self.fetch_links(url)
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.frontier_pool, self.add_urls_to_visit, links)
+        except Exception as e:
+            logging.exception(f'Failed to crawl: {url}. Error: {e}')
+        finally:
+            self.save_visited_url(url)
+
+    async def worker(self):
+        """
+        Take URLs off the queue and crawl them until cancelled.
+        Errors are logged per URL so a failing page can't kill the worker and leave run() waiting forever.
+        """
+        while True:
+            url = await self.urls_to_visit.get()
+            try:
+                try:
+                    await self.crawl(url)
+                finally:
+                    await self.refill_queue()  # Before task_done, so join() can't return while the frontier has URLs
+            except Exception as e:
+                logging.exception(f'Worker failed on: {url}. Error: {e}')
+            finally:
+                self.urls_to_visit.task_done()
+
+    async def run(self):
+        """
+        Main method to start crawling. Runs `max_concurrency` workers until the queue is exhausted.
+        """
+        try:
+            await self.init_browser()  # Initialize the browser
+            await self.refill_queue()
+            workers = [asyncio.create_task(self.worker()) for _ in range(self.max_concurrency)]
+            await self.urls_to_visit.join()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        finally:
+            await self.close_browser()  # Ensure browser is closed
+
+
+async def main():
+    """
+    Entry point for the web crawler script. Define URLs to crawl and initiate the crawler.
+    """
+    urls_to_crawl = [
+        "https://www.forbes.com/sites/digital-assets/2024/11/27/sudden-panic-sparks-200-billion-bitcoin-and-crypto-price-crash/"
+    ]
+
+    for url in urls_to_crawl:
+        logging.info(f"Starting crawl for: {url}")
+        crawler = Crawler(urls=[url], max_urls=50, output_file='visited_links.txt')
+        await crawler.run()
+        logging.info(f"Finished crawl for: {url}")
+        logging.info(f"Visited {crawler.visited_count} pages for {url}")
+
+
+if __name__ == '__main__':
+    try:
+        import uvloop  # Faster libuv-based event loop, not available on Windows
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -1,6 +1,20 @@
 import pytest
 import asyncio
-from src.web_crawler import Crawler
+import httpx
+from src import web_crawler
+from src.web_crawler import Crawler, FrontierDRUM
+
+
+def drain_frontier(crawler):
+    """
+    Empty the crawler's frontier and return the pending URLs in order.
+    """
+    urls = []
+    batch = crawler.take_from_frontier(10)
+    while batch:
+        urls.extend(batch)
+        batch = crawler.take_from_frontier(10)
+    return urls
 
 
 @pytest.mark.asyncio
@@ -17,8 +31,9 @@ async def test_crawler_initialization():
     assert crawler.urls == initial_urls
     assert crawler.max_urls == max_urls
     assert crawler.output_file == output_file
-    assert crawler.visited_urls == set()
-    assert crawler.urls_to_visit == set(initial_urls)
+    assert crawler.visited_count == 0
+    assert drain_frontier(crawler) == initial_urls
+    crawler.close_frontier()
 
 
 @pytest.mark.asyncio
@@ -32,8 +47,89 @@ async def test_add_url_to_visit():
     new_url = "https://example.com/page"
     crawler.add_url_to_visit(new_url)
 
-    assert new_url in crawler.urls_to_visit
-    assert new_url not in crawler.visited_urls
+    assert sorted(drain_frontier(crawler)) == [initial_urls[0], new_url]
+    assert crawler.visited_count == 0
+
+    # Already seen URLs are not queued again
+    crawler.add_url_to_visit(new_url)
+    crawler.add_url_to_visit(initial_urls[0])
+    assert drain_frontier(crawler) == []
+    crawler.close_frontier()
+
+
+@pytest.mark.parametrize("bucket_cap_mb", [0, 16])
+def test_frontier_deduplication(tmp_path, bucket_cap_mb):
+    """
+    Test that the frontier returns each URL once, whether buckets merge on every add or only on pop.
+    """
+    frontier = FrontierDRUM(str(tmp_path), num_buckets=4, bucket_cap_mb=bucket_cap_mb)
+    urls = [f"https://example.com/page{i}" for i in range(10)]
+
+    for url in urls[:6] + urls[:3]:
+        frontier.add(url)
+    assert sorted(frontier.pop() for _ in range(6)) == urls[:6]
+
+    for url in urls:
+        frontier.add(url)
+    assert sorted(frontier.pop() for _ in range(4)) == urls[6:]
+    assert frontier.pop() is None
+    frontier.close()
+
+
+@pytest.mark.asyncio
+async def test_frontier_resume(tmp_path):
+    """
+    Test that a frontier reopened on the same directory picks up queued and unmerged URLs
+    while still remembering the URLs it already handed out, and that a crawler stopping at
+    max_urls or interrupted before visiting its queue doesn't lose any URL.
+    """
+    urls = {"https://example.com/a", "https://example.com/b"}
+    frontier = FrontierDRUM(str(tmp_path), num_buckets=4)
+    for url in urls:
+        frontier.add(url)
+    visited = frontier.pop()
+    frontier.add("https://example.com/unmerged")
+    frontier.close()
+
+    frontier = FrontierDRUM(str(tmp_path), num_buckets=4)
+    frontier.add(visited)
+    remaining = []
+    url = frontier.pop()
+    while url is not None:
+        remaining.append(url)
+        url = frontier.pop()
+    frontier.close()
+
+    assert sorted(remaining) == sorted(urls - {visited} | {"https://example.com/unmerged"})
+
+    seeds = [f"https://example.com/p{i}" for i in range(8)]
+    crawler = Crawler(urls=seeds, max_urls=2, max_concurrency=2, frontier_dir=str(tmp_path / "crawl"),
+                      output_file=str(tmp_path / "visited_links.txt"))
+    crawled = []
+
+    async def fetch_links(url):
+        crawled.append(url)
+        return []
+
+    crawler.fetch_links = fetch_links
+    await crawler.refill_queue()
+    workers = [asyncio.create_task(crawler.worker()) for _ in range(crawler.max_concurrency)]
+    await asyncio.wait_for(crawler.urls_to_visit.join(), timeout=5)
+    for worker in workers:
+        worker.cancel()
+    crawler.close_output()
+    crawler.close_frontier()
+
+    # Stop after queueing the next URLs but before visiting them
+    crawler = Crawler(urls=seeds, max_urls=2, max_concurrency=2, frontier_dir=str(tmp_path / "crawl"))
+    await crawler.refill_queue()
+    assert crawler.urls_to_visit.qsize() == 2
+    crawler.close_frontier()
+
+    crawler = Crawler(urls=seeds, frontier_dir=str(tmp_path / "crawl"))
+    assert len(crawled) == 2
+    assert sorted(crawled + drain_frontier(crawler)) == seeds
+    crawler.close_frontier()
 
 
 @pytest.mark.asyncio
@@ -62,24 +158,307 @@ async def test_link_extraction():
 
 
 @pytest.mark.asyncio
-async def test_crawl_single_url():
+async def test_link_pattern_filtering():
+    """
+    Test that only links containing one of the configured patterns are extracted.
+    """
+    base_url = "https://example.com"
+    sample_html = """
+    <html>
+        <body>
+            <a href="/our-insights/article">Insight</a>
+            <a href="https://example.com/featured-insights/report">Featured</a>
+            <a href="/careers">Careers</a>
+        </body>
+    </html>
+    """
+    crawler = Crawler(urls=[], link_patterns=["our-insights", "featured-insights"])
+    extracted_links = list(crawler.get_linked_urls(base_url, sample_html))
+
+    assert extracted_links == [
+        "https://example.com/our-insights/article",
+        "https://example.com/featured-insights/report",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fragment_and_relative_link_extraction():
+    """
+    Test that fragments are stripped and relative links are resolved, whether hrefs come raw
+    from the HTML or already resolved by the browser.
+    """
+    base_url = "https://example.com/docs/a"
+    sample_html = """
+    <html>
+        <body>
+            <a href="#top">Top</a>
+            <a href="page2">Page 2</a>
+            <a href="/page3#section">Page 3</a>
+            <a href="mailto:team@example.com">Mail</a>
+        </body>
+    </html>
+    """
+    crawler = Crawler(urls=[])
+    expected = ["https://example.com/docs/page2", "https://example.com/page3"]
+    assert list(crawler.get_linked_urls(base_url, sample_html)) == expected
+
+    browser_hrefs = [
+        "https://example.com/docs/a#top",
+        "https://example.com/docs/page2",
+        "https://example.com/page3#section",
+        "mailto:team@example.com",
+    ]
+    assert list(web_crawler._filter_links(base_url, browser_hrefs)) == expected
+
+
+@pytest.mark.asyncio
+async def test_protocol_relative_link_extraction():
+    """
+    Test that protocol-relative links are only kept when they point to the base URL's domain.
+    """
+    base_url = "https://example.com/articles"
+    sample_html = """
+    <html>
+        <body>
+            <a href="//example.com/page1">Page 1</a>
+            <a href="//otherdomain.com/page">External Link</a>
+        </body>
+    </html>
+    """
+    crawler = Crawler(urls=[])
+    extracted_links = list(crawler.get_linked_urls(base_url, sample_html))
+
+    assert extracted_links == ["https://example.com/page1"]
+
+
+@pytest.mark.asyncio
+async def test_wait_politely():
+    """
+    Test that requests to the same host are spaced out while other hosts are not delayed.
+    """
+    crawler = Crawler(urls=[], politeness_delay=0.2)
+
+    await crawler.wait_politely("https://example.com/page1")
+    started = asyncio.get_running_loop().time()
+    await crawler.wait_politely("https://otherdomain.com/page")
+    assert asyncio.get_running_loop().time() - started < 0.1
+
+    await crawler.wait_politely("https://example.com/page2")
+    assert asyncio.get_running_loop().time() - started >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_crawl_single_url(tmp_path):
     """
     Test the crawl method to ensure it processes a single URL.
     """
     initial_urls = ["https://example.com"]
-    crawler = Crawler(urls=initial_urls, max_urls=1)
+    crawler = Crawler(urls=initial_urls, max_urls=1, output_file=str(tmp_path / "visited_links.txt"))
 
-    # Mock the download_url method to return static HTML
-    crawler.download_url = asyncio.coroutine(lambda _: """
+    # Mock the network checks and the fetch_static method to return static HTML
+    async def always(_):
+        return True
+
+    async def fetch_static(url):
+        return True, """
     <html>
         <body>
             <a href="/page1">Page 1</a>
         </body>
     </html>
-    """)
+    """, url
+
+    crawler.host_resolves = always
+    crawler.fetch_static = fetch_static
 
     await crawler.crawl(initial_urls[0])
 
     # Check that the crawler added the new URL
-    assert "https://example.com/page1" in crawler.urls_to_visit
-    assert initial_urls[0] in crawler.visited_urls
+    assert "https://example.com/page1" in drain_frontier(crawler)
+    assert crawler.visited_count == 1
+
+    # Check that only the crawled URL was written to the output file
+    crawler.close_output()
+    crawler.close_frontier()
+    assert (tmp_path / "visited_links.txt").read_text() == initial_urls[0] + "\n"
+
+
+@pytest.mark.asyncio
+async def test_fetch_static():
+    """
+    Test that fetch_static returns server-rendered pages and leaves the rest to the browser.
+    """
+    static_html = "<html><body>" + '<a href="/page">Page</a>' * 5 + "</body></html>"
+    pages = {
+        "/static": httpx.Response(200, html=static_html),
+        "/dynamic": httpx.Response(200, html="<html><body><div id='app'></div></body></html>"),
+        "/missing": httpx.Response(404, html=static_html),
+    }
+    crawler = Crawler(urls=[])
+    crawler.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: pages[request.url.path]))
+
+    for path, html in [("/static", static_html), ("/dynamic", None), ("/missing", None)]:
+        url = "https://example.com" + path
+        assert await crawler.fetch_static(url) == (True, html, url)
+    await crawler.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_links_resolved_after_redirect():
+    """
+    Test that links on a redirected page are resolved and filtered against the URL it was served from.
+    """
+    hrefs = ["child", "/root-rel", "https://other.com/abs", "https://example.com/x"] * 2
+    page_html = "<html><body>" + "".join(f'<a href="{href}">Link</a>' for href in hrefs) + "</body></html>"
+
+    def handler(request):
+        if request.url.host == "example.com":
+            return httpx.Response(301, headers={"location": "https://other.com/section/"})
+        return httpx.Response(200, html=page_html)
+
+    async def always(_):
+        return True
+
+    crawler = Crawler(urls=[], politeness_delay=0)
+    crawler.host_resolves = always
+    crawler.client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+
+    links = await crawler.fetch_links("https://example.com/go")
+    assert links == ["https://other.com/section/child", "https://other.com/root-rel", "https://other.com/abs"] * 2
+    await crawler.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_rendered_links_after_redirect():
+    """
+    Test that links read from the browser are filtered against the URL the page ended up on.
+    """
+    class FakePage:
+        url = "https://www.example.com/"
+
+        async def goto(self, url, **kwargs):
+            pass
+
+        async def wait_for_selector(self, selector, **kwargs):
+            pass
+
+        async def eval_on_selector_all(self, selector, script):
+            return ["https://www.example.com/page1", "https://www.example.com/#top", "https://other.com/page"]
+
+    class FakeContext:
+        async def route(self, pattern, handler):
+            pass
+
+        async def new_page(self):
+            return FakePage()
+
+        async def close(self):
+            pass
+
+    class FakeBrowser:
+        async def new_context(self, **kwargs):
+            return FakeContext()
+
+    crawler = Crawler(urls=[])
+    crawler.browser = FakeBrowser()
+
+    assert await crawler.render_links("http://example.com") == ["https://www.example.com/page1"]
+
+
+@pytest.mark.asyncio
+async def test_skip_non_html():
+    """
+    Test that asset URLs are never queued and non-HTML responses are detected from their headers.
+    """
+    crawler = Crawler(urls=[])
+    crawler.add_url_to_visit("https://example.com/report.PDF")
+    crawler.add_url_to_visit("https://example.com/logo.png?v=2")
+    assert drain_frontier(crawler) == []
+
+    content_types = {
+        "/page": "text/html; charset=utf-8",
+        "/download": "application/octet-stream",
+    }
+    crawler.client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, headers={"content-type": content_types[request.url.path]})
+    ))
+    assert (await crawler.fetch_static("https://example.com/page"))[0]
+    assert await crawler.fetch_static("https://example.com/download") == (False, None, "https://example.com/download")
+    await crawler.client.aclose()
+    crawler.close_frontier()
+
+
+@pytest.mark.asyncio
+async def test_workers_stop_at_max_urls(tmp_path):
+    """
+    Test that workers drain the queue but crawl no more than max_urls pages.
+    """
+    initial_urls = ["https://example.com/a", "https://example.com/b", "https://example.com/c"]
+    crawler = Crawler(urls=initial_urls, max_urls=2, output_file=str(tmp_path / "visited_links.txt"),
+                      max_concurrency=2)
+    crawled = []
+
+    async def fetch_links(url):
+        crawled.append(url)
+        return []
+
+    crawler.fetch_links = fetch_links
+    await crawler.refill_queue()
+    workers = [asyncio.create_task(crawler.worker()) for _ in range(crawler.max_concurrency)]
+    await asyncio.wait_for(crawler.urls_to_visit.join(), timeout=5)
+    for worker in workers:
+        worker.cancel()
+
+    assert len(crawled) == 2 and set(crawled) <= set(initial_urls)
+    assert crawler.visited_count == 2
+    assert crawler.urls_to_visit.empty()
+    crawler.close_output()
+    crawler.close_frontier()
+
+
+def test_save_visited_urls(tmp_path, monkeypatch):
+    """
+    Test that visited URLs are appended to the output file across remaps and crawler runs.
+    """
+    monkeypatch.setattr(web_crawler, "OUTPUT_CHUNK", 64)
+    output_file = tmp_path / "visited_links.txt"
+    output_file.write_text("https://example.com/previous\n")
+    urls = [f"https://example.com/page{i}" for i in range(20)]
+
+    crawler = Crawler(urls=[], output_file=str(output_file))
+    for url in urls[:10]:
+        crawler.save_visited_url(url)
+    crawler.close_output()
+
+    crawler = Crawler(urls=[], output_file=str(output_file))
+    for url in urls[10:]:
+        crawler.save_visited_url(url)
+    crawler.close_output()
+
+    assert output_file.read_text() == "\n".join(["https://example.com/previous"] + urls) + "\n"
+
+
+@pytest.mark.asyncio
+async def test_workers_survive_errors():
+    """
+    Test that an error while crawling one URL doesn't kill the workers and stall the queue.
+    """
+    initial_urls = [f"https://example.com/page{i}" for i in range(10)]
+    crawler = Crawler(urls=initial_urls, max_concurrency=2)
+
+    async def fetch_links(url):
+        return []
+
+    def save_visited_url(url):
+        raise OSError("disk full")
+
+    crawler.fetch_links = fetch_links
+    crawler.save_visited_url = save_visited_url
+    await crawler.refill_queue()
+    workers = [asyncio.create_task(crawler.worker()) for _ in range(crawler.max_concurrency)]
+    await asyncio.wait_for(crawler.urls_to_visit.join(), timeout=5)
+    for worker in workers:
+        worker.cancel()
+
+    assert crawler.visited_count == len(initial_urls)
+    crawler.close_frontier()